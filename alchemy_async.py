@@ -0,0 +1,181 @@
+import asyncio
+import os
+import time
+import httpx
+from sqlalchemy import select
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import create_async_engine
+
+import alchemy_v9
+from alchemy_v9 import (
+    AutoBase,
+    loggers,
+    create_table_if_not_exists,
+    created_outcome,
+    duplicate_outcome,
+    failure_outcome,
+    get_statement,
+    log_batch_summary,
+    log_outcome,
+    matches_single_row,
+    mutation_outcome,
+    resolve_operation,
+    routing_key,
+    unknown_columns,
+    upsert_outcome,
+    uses_native_upsert,
+)
+
+# Async drivers used for each database backend
+ASYNC_DRIVERS = {"postgresql": "postgresql+asyncpg", "sqlite": "sqlite+aiosqlite"}
+
+# Function to derive the async database URL from the sync engine's URL
+def async_database_url(url):
+    url = make_url(url)
+    return url.set(drivername=ASYNC_DRIVERS.get(url.get_backend_name(), url.drivername))
+
+# Async database URL (override with the ASYNC_DATABASE_URL environment variable)
+ASYNC_DATABASE_URL = os.environ.get("ASYNC_DATABASE_URL") or async_database_url(alchemy_v9.engine.url)
+
+# Number of operations in flight at once; operations on the same (table, id) still run in order
+MAX_IN_FLIGHT = 50
+LANE_QUEUE_SIZE = 1000
+
+# Async engine (the reflected metadata and mapped classes are shared with alchemy_v9)
+async_engine = create_async_engine(ASYNC_DATABASE_URL)
+
+# Process a single operation with Core statements on an async connection
+async def process_operation_async(operation):
+    try:
+        table_name = operation.get("table")
+        if table_name and not AutoBase.classes.get(table_name):
+            # Table creation and reflection are blocking, keep them off the event loop
+            await asyncio.to_thread(create_table_if_not_exists, table_name, operation.get("data", {}))
+        resolved = resolve_operation(operation)
+        if not resolved:
+            return
+        TableClass, filtered_data = resolved
+        table = TableClass.__table__
+        op_type = operation.get("operation")
+        condition = operation.get("condition", {})
+
+        async with async_engine.connect() as connection:
+            if op_type == "create" and uses_native_upsert(table):
+                # Same cached INSERT ... ON CONFLICT as the sync executors, run on the underlying connection
+                outcome = await connection.run_sync(upsert_outcome, table, filtered_data)
+                await connection.commit()
+                log_outcome(outcome)
+                return
+            if op_type == "create":
+                try:
+                    await connection.execute(get_statement(table, "create", tuple(filtered_data)), filtered_data)
+                    await connection.commit()
+                    outcome = created_outcome(table_name, filtered_data)
+                except IntegrityError:
+                    await connection.rollback()
+                    outcome = duplicate_outcome(table_name, filtered_data)
+                log_outcome(outcome)
+                return
+            if op_type not in ("update", "delete"):
+                return
+
+            unknown = unknown_columns(table, condition)
+            if unknown:
+                log_outcome(failure_outcome(table_name, "Unknown condition columns in '%s': %s. Skipping operation.", table_name, set(unknown)))
+                return
+            target = condition
+            if not matches_single_row(table, condition) or (op_type == "update" and not filtered_data):
+                # Like query().first(): without a key condition only the first matching row is affected,
+                # and an empty update only has to find its row
+                pk_columns = list(table.primary_key.columns)
+                query = select(*pk_columns).where(*[table.c[k] == v for k, v in condition.items()]).limit(1)
+                row = (await connection.execute(query)).first()
+                target = dict(zip([col.name for col in pk_columns], row)) if row else None
+
+            rowcount = 0
+            if target is not None and (op_type == "delete" or filtered_data):
+                data_columns = tuple(filtered_data) if op_type == "update" else ()
+                statement = get_statement(table, op_type, data_columns, tuple(target))
+                params = {**{f"c_{k}": v for k, v in target.items()}, **{f"v_{k}": filtered_data[k] for k in data_columns}}
+                rowcount = (await connection.execute(statement, params)).rowcount
+                await connection.commit()
+            elif target is not None:
+                rowcount = 1  # empty update on a row that exists
+            log_outcome(mutation_outcome(table_name, op_type, filtered_data, condition, rowcount))
+
+    except Exception as e:
+        log_outcome(failure_outcome(operation.get("table") if isinstance(operation, dict) else None, "Unexpected error processing operation %s: %s", operation, e))
+
+# Execute operations on MAX_IN_FLIGHT key-ordered lanes: operations on the same (table, id)
+# run in payload order, different keys run concurrently
+async def execute_operations_async(operations):
+    started = time.monotonic()
+    lanes = [asyncio.Queue(maxsize=LANE_QUEUE_SIZE) for _ in range(MAX_IN_FLIGHT)]
+
+    async def run_lane(lane):
+        while True:
+            operation = await lane.get()
+            try:
+                if operation is None:
+                    return
+                await process_operation_async(operation)
+            finally:
+                lane.task_done()
+
+    # Create missing tables in payload order first, so the first operation on a table defines it
+    for operation in operations:
+        if isinstance(operation, dict) and operation.get("table") and not AutoBase.classes.get(operation["table"]):
+            await asyncio.to_thread(create_table_if_not_exists, operation["table"], operation.get("data", {}))
+
+    workers = [asyncio.create_task(run_lane(lane)) for lane in lanes]
+    pinned = set()
+    try:
+        for operation in operations:
+            key = routing_key(operation, pinned)
+            if key is not None:
+                await lanes[hash(key) % len(lanes)].put(operation)
+            else:
+                # Drain every lane first, then run the operation on its own
+                for lane in lanes:
+                    await lane.join()
+                await process_operation_async(operation)
+    finally:
+        for lane in lanes:
+            await lane.put(None)
+        await asyncio.gather(*workers)
+    log_batch_summary(time.monotonic() - started)
+    loggers["info"].info("All operations have been processed.")
+
+# Fetch the source with an async HTTP client and apply its operations
+async def main_async(url=None):
+    url = url or alchemy_v9.SOURCE_URL
+    timeout = httpx.Timeout(alchemy_v9.HTTP_READ_TIMEOUT, connect=alchemy_v9.HTTP_CONNECT_TIMEOUT)
+    async with httpx.AsyncClient(timeout=timeout) as client:
+        try:
+            response = await client.get(url)
+        except httpx.HTTPError as e:
+            loggers["failures"].error(f"Request to {url} failed: {e}")
+            return
+    try:
+        json_data = response.json()
+    except ValueError:
+        loggers["failures"].error(f"Invalid JSON response received: {response.text}")
+        return
+    if "data" in json_data:
+        await execute_operations_async(json_data["data"])
+    else:
+        loggers["failures"].error("JSON response does not contain 'data' key.")
+
+# Run one poll; pooled connections are bound to the event loop, so dispose them before it closes
+async def run_once():
+    try:
+        await main_async()
+    finally:
+        await async_engine.dispose()
+
+def main():
+    asyncio.run(run_once())
+
+if __name__ == "__main__":
+    main()
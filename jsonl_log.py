@@ -0,0 +1,186 @@
+#Append-only JSON lines log files for the loggers folder
+
+import atexit
+import json
+import os
+import sys
+import threading
+import time
+
+# Log folder and buffering: entries are written once FLUSH_EVERY of them are buffered or the
+# oldest is FLUSH_INTERVAL seconds old, and fsynced at most every FSYNC_INTERVAL seconds
+LOG_DIR = "loggers"
+FLUSH_EVERY = 100
+FLUSH_INTERVAL = 1.0
+FSYNC_INTERVAL = 5.0
+
+# Suffix of migrated array-format files (kept as a backup, never converted twice)
+MIGRATED_SUFFIX = ".migrated"
+
+# Buffered writer for one JSON lines file: one JSON document per line, appended only
+class JsonlWriter:
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, "a", encoding="utf-8")
+        if self.file.tell() > 0:
+            with open(path, "rb") as existing:
+                existing.seek(-1, os.SEEK_END)
+                if existing.read(1) != b"\n":
+                    # Torn last line from a crash: end it so new entries start on their own line
+                    self.file.write("\n")
+        self.buffer = []
+        self.lock = threading.Lock()
+        self.first_buffered = None
+        self.last_fsync = time.monotonic()
+
+    def write(self, entry):
+        line = json.dumps(entry, ensure_ascii=False, default=str) + "\n"
+        with self.lock:
+            if not self.buffer:
+                self.first_buffered = time.monotonic()
+            self.buffer.append(line)
+            if len(self.buffer) >= FLUSH_EVERY or time.monotonic() - self.first_buffered >= FLUSH_INTERVAL:
+                self._flush()
+
+    def flush(self, fsync=False):
+        with self.lock:
+            self._flush(fsync)
+
+    def _flush(self, fsync=False):
+        if self.buffer:
+            self.file.write("".join(self.buffer))
+            self.buffer = []
+            self.file.flush()
+        if fsync or time.monotonic() - self.last_fsync >= FSYNC_INTERVAL:
+            os.fsync(self.file.fileno())
+            self.last_fsync = time.monotonic()
+
+    def close(self):
+        with self.lock:
+            self._flush(fsync=True)
+            self.file.close()
+
+# Open writers by path, plus the background thread flushing entries that wait too long
+writers = {}
+writers_lock = threading.Lock()
+flusher = None
+
+# Function to get the JSON lines path for a log file name (e.g. created_records.json -> .jsonl)
+def jsonl_path(filename):
+    return os.path.join(LOG_DIR, os.path.splitext(filename)[0] + ".jsonl")
+
+# Migrate an array-format log file (a JSON array of entries) to JSON lines, once.
+# Its entries go before anything already in the JSON lines file; the original is renamed
+# to <name>.migrated. Returns the number of migrated entries (None if it was not an array file).
+def convert_array_file(path):
+    try:
+        with open(path, encoding="utf-8") as file:
+            entries = json.load(file)
+    except (OSError, json.JSONDecodeError):
+        return None
+    if not isinstance(entries, list):
+        return None
+
+    target = os.path.splitext(path)[0] + ".jsonl"
+    temp_path = target + ".tmp"
+    with open(temp_path, "w", encoding="utf-8") as file:
+        for entry in entries:
+            file.write(json.dumps(entry, ensure_ascii=False, default=str) + "\n")
+        if os.path.exists(target):
+            with open(target, encoding="utf-8") as existing:
+                for line in existing:
+                    file.write(line)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temp_path, target)
+    os.replace(path, path + MIGRATED_SUFFIX)
+    return len(entries)
+
+# Migrate every array-format .json log file in the log folder
+def convert_log_dir(log_dir=None):
+    log_dir = log_dir or LOG_DIR
+    converted = {}
+    for name in sorted(os.listdir(log_dir)):
+        if name.endswith(".json"):
+            count = convert_array_file(os.path.join(log_dir, name))
+            if count is not None:
+                converted[name] = count
+    return converted
+
+# Function to get (or open) the writer for a log file, migrating its array-format file first
+def get_writer(filename):
+    path = jsonl_path(filename)
+    writer = writers.get(path)
+    if writer:
+        return writer
+    with writers_lock:
+        if path not in writers:
+            os.makedirs(LOG_DIR, exist_ok=True)  # Ensure 'loggers' folder exists
+            legacy_path = os.path.join(LOG_DIR, filename)
+            if legacy_path != path and os.path.exists(legacy_path):
+                convert_array_file(legacy_path)
+            writers[path] = JsonlWriter(path)
+            start_flusher()
+        return writers[path]
+
+# Append one entry to a log file in the log folder
+def append_entry(filename, entry):
+    get_writer(filename).write(entry)
+
+# Flush every open writer (with fsync when asked)
+def flush_all(fsync=False):
+    for writer in list(writers.values()):
+        writer.flush(fsync)
+
+# Flush and close every open writer
+def close_all():
+    with writers_lock:
+        for writer in writers.values():
+            writer.close()
+        writers.clear()
+
+atexit.register(close_all)
+
+# Start the background thread that writes out entries buffered for longer than FLUSH_INTERVAL
+def start_flusher():
+    global flusher
+    if flusher is not None:
+        return
+
+    def run():
+        while True:
+            time.sleep(FLUSH_INTERVAL / 2)
+            for writer in list(writers.values()):
+                with writer.lock:
+                    if writer.buffer and time.monotonic() - writer.first_buffered >= FLUSH_INTERVAL:
+                        writer._flush()
+
+    flusher = threading.Thread(target=run, name="jsonl-log-flusher", daemon=True)
+    flusher.start()
+
+# Yield the entries of a log file one at a time. Torn lines (a crash mid-write) are skipped.
+def read_entries(filename):
+    path = jsonl_path(filename)
+    if path in writers:
+        writers[path].flush()
+    try:
+        file = open(path, encoding="utf-8")
+    except FileNotFoundError:
+        return
+    with file:
+        for line in file:
+            if not line.endswith("\n") or not line.strip():
+                continue
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            yield entry
+
+# One-time migration: python jsonl_log.py convert [log folder]
+if __name__ == "__main__":
+    if len(sys.argv) >= 2 and sys.argv[1] == "convert":
+        for name, count in convert_log_dir(sys.argv[2] if len(sys.argv) > 2 else None).items():
+            print(f"Converted {name}: {count} entries")
+    else:
+        print("Usage: python jsonl_log.py convert [log folder]")
@@ -0,0 +1,134 @@
+#Metrics registry (counters, gauges, latency histograms) with Prometheus text export
+
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Latency histogram bucket upper bounds in seconds
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+# Registered metrics: {name: (type, help)}, and values keyed by (name, sorted label pairs).
+# Histogram values are [count per bucket (+Inf last), sum, count]; gauge values may be callables
+# evaluated at export time.
+metric_info = {}
+counters = {}
+gauges = {}
+histograms = {}
+registry_lock = threading.Lock()
+
+# Register the type and help text of a metric
+def describe(name, metric_type, help_text):
+    metric_info[name] = (metric_type, help_text)
+
+# Function to build the registry key of a metric and its labels
+def metric_key(name, labels):
+    return name, tuple(sorted(labels.items()))
+
+# Add to a counter
+def inc(name, value=1, **labels):
+    key = metric_key(name, labels)
+    with registry_lock:
+        counters[key] = counters.get(key, 0) + value
+
+# Set a gauge to a value, or to a function returning the current value
+def set_gauge(name, value, **labels):
+    gauges[metric_key(name, labels)] = value
+
+# Record one observation (in seconds) in a latency histogram
+def observe(name, seconds, **labels):
+    key = metric_key(name, labels)
+    with registry_lock:
+        histogram = histograms.get(key)
+        if histogram is None:
+            histogram = histograms[key] = [[0] * (len(LATENCY_BUCKETS) + 1), 0.0, 0]
+        histogram[0][bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        histogram[1] += seconds
+        histogram[2] += 1
+
+# Time the enclosed block into a latency histogram
+@contextmanager
+def timed(name, **labels):
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(name, time.perf_counter() - started, **labels)
+
+# Function to format a label set (plus extra labels) in the Prometheus text format
+def format_labels(labels, **extra):
+    pairs = list(labels) + list(extra.items())
+    if not pairs:
+        return ""
+    escaped = (str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"') for _, value in pairs)
+    return "{" + ",".join(f'{label}="{value}"' for (label, _), value in zip(pairs, escaped)) + "}"
+
+# Function to render every metric in the Prometheus text exposition format
+def render():
+    with registry_lock:
+        counter_values = dict(counters)
+        histogram_values = {key: (list(buckets), total, count) for key, (buckets, total, count) in histograms.items()}
+    gauge_values = {}
+    for key, value in list(gauges.items()):
+        try:
+            gauge_values[key] = value() if callable(value) else value
+        except Exception:
+            continue  # e.g. the measured object is gone; leave the gauge out of this scrape
+
+    lines = []
+    for metric_type, values in (("counter", counter_values), ("gauge", gauge_values), ("histogram", histogram_values)):
+        for name in sorted({name for name, _ in values}):
+            help_text = metric_info.get(name, (metric_type, name))[1]
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {metric_type}")
+            for (metric_name, labels), value in sorted(values.items(), key=lambda item: item[0]):
+                if metric_name != name:
+                    continue
+                if metric_type != "histogram":
+                    lines.append(f"{name}{format_labels(labels)} {value}")
+                    continue
+                buckets, total, count = value
+                cumulative = 0
+                for bound, bucket_count in zip(list(LATENCY_BUCKETS) + ["+Inf"], buckets):
+                    cumulative += bucket_count
+                    lines.append(f"{name}_bucket{format_labels(labels, le=bound)} {cumulative}")
+                lines.append(f"{name}_sum{format_labels(labels)} {total}")
+                lines.append(f"{name}_count{format_labels(labels)} {count}")
+    return "\n".join(lines) + "\n"
+
+# Write the current metrics to a file (replaced atomically)
+def dump(path):
+    temp_path = path + ".tmp"
+    with open(temp_path, "w", encoding="utf-8") as file:
+        file.write(render())
+    os.replace(temp_path, path)
+
+# HTTP handler serving the metrics on GET /metrics
+class MetricsRequestHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # scrapes are not worth a console line each
+
+# Running metrics server, if any
+metrics_server = None
+
+# Serve the metrics on http://<host>:<port>/metrics from a background thread (once per process)
+def start_http_server(port, host="127.0.0.1"):
+    global metrics_server
+    if metrics_server is None:
+        metrics_server = ThreadingHTTPServer((host, port), MetricsRequestHandler)
+        metrics_server.daemon_threads = True
+        threading.Thread(target=metrics_server.serve_forever, name="metrics-server", daemon=True).start()
+    return metrics_server